@@ -4,25 +4,133 @@ Automated Trader - Sistema de Trading Automatizado (Versión Corregida)
 """
 
 import time
+import signal
 import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Set
 import json
-import sys
-import importlib.util
 
 # Import modules
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-StockDataCollector = data_collector.StockDataCollector
-
-
-
+from data_collector import StockDataCollector
 from position_manager import PositionManager, PositionDecision
 from earnings_calendar import EarningsChecker
 
 class AutomatedTrader:
+    ALERT_EMOJIS = {
+        "BUY_SIGNAL": "🎯",
+        "POSITION_OPENED": "📈",
+        "SELL_IMMEDIATELY": "🔴",
+        "CONSIDER_SELL": "⚠️",
+        "PARTIAL_PROFIT": "💰",
+        "MANUAL_REVIEW": "👁️",
+        "MANUAL_REVIEW_URGENT": "🚨"
+    }
+    MANUAL_KEYWORDS = ("Real position", "Manual", "DEGIRO", "REVOLUT", "Real")
+    MANUAL_SYMBOLS = frozenset(["BTC-USD", "NDAQ", "BNTX", "XAG-USD", "PPFB.L", "SXLE.MI", "DFEN", "VUSD.L"])
+    BUY_SCORE_THRESHOLD = 5
+    ANALYSIS_BONUS = 2  # Puntos máximos que aporta analyze_stock_potential
+    # Watchlist de stocks populares
+    # EXPANDED WATCHLIST - 150+ symbols
+    US_LARGE_CAP = [
+        # FAANG + Big Tech
+        "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "META", "TSLA", "NVDA", "NFLX", "ADBE",
+        # Additional Tech
+        "CRM", "ORCL", "INTC", "AMD", "QCOM", "AVGO", "TXN", "MU", "AMAT", "LRCX",
+        "KLAC", "MRVL", "SWKS", "MCHP", "CTSH", "INFY", "ACN", "IBM", "HPQ", "DELL",
+        # Cloud/Software  
+        "NOW", "TEAM", "ZM", "DOCU", "CRWD", "ZS", "OKTA", "DDOG", "SNOW", "MDB",
+        # Semiconductors
+        "TSM", "ASML", "LAM", "KLAC", "AMAT", "TER", "MPWR", "MXIM", "ADI", "ON"
+    ]
+    FINANCE_SECTOR = [
+        # Banks
+        "JPM", "BAC", "WFC", "C", "GS", "MS", "USB", "PNC", "TFC", "COF",
+        # Insurance
+        "BRK-B", "AIG", "PGR", "TRV", "AXP", "ALL", "CB", "AON", "MMC", "MARSH",
+        # Financial Services
+        "V", "MA", "PYPL", "SQ", "COIN", "ICE", "CME", "NDAQ", "SPGI", "MCO",
+        "MSCI", "BLK", "SCHW", "TROW", "AMG", "BEN", "IVZ", "FDS"
+    ]
+    HEALTHCARE_BIOTECH = [
+        # Big Pharma
+        "JNJ", "PFE", "ABBV", "MRK", "LLY", "BMY", "AMGN", "GILD", "BIIB", "REGN",
+        # Biotech
+        "MRNA", "BNTX", "NVAX", "VRTX", "CELG", "ILMN", "BMRN", "TECH", "SRPT", "BLUE",
+        # Medical Devices
+        "MDT", "ABT", "TMO", "DHR", "SYK", "BSX", "EW", "HOLX", "A", "ZBH",
+        # Healthcare Services
+        "UNH", "ANTM", "CVS", "CI", "HUM", "CNC", "MOH", "ELV", "VEEV"
+    ]
+    ENERGY_COMMODITIES = [
+        # Oil & Gas
+        "XOM", "CVX", "COP", "EOG", "SLB", "HAL", "BKR", "NOV", "FTI", "HP",
+        # Renewables
+        "NEE", "ENPH", "SEDG", "FSLR", "SPWR", "RUN", "BE", "PLUG", "BALLARD",
+        # Commodities ETFs
+        "GLD", "SLV", "PDBC", "DBA", "USO", "UNG", "CPER", "JJN", "JJU", "JJG"
+    ]
+    CONSUMER_RETAIL = [
+        # Retail
+        "WMT", "HD", "TGT", "LOW", "COST", "TJX", "SBUX", "MCD", "CMG", "BKNG",
+        # Consumer Goods
+        "PG", "KO", "PEP", "NKE", "UL", "CL", "KMB", "GIS", "K", "CPB",
+        # Luxury/Discretionary
+        "LVMUY", "TPG", "RL", "COH", "KORS", "LULU", "DECK", "CROX", "ETSY"
+    ]
+    INDUSTRIAL_DEFENSE = [
+        # Aerospace/Defense
+        "BA", "LMT", "RTX", "NOC", "GD", "LHX", "HII", "LDOS", "DFEN",
+        # Industrial
+        "CAT", "DE", "MMM", "GE", "HON", "UPS", "FDX", "DAL", "UAL", "AAL",
+        # Materials
+        "FCX", "NEM", "GOLD", "AA", "X", "CLF", "STLD", "NUE", "MLM", "VMC"
+    ]
+    UTILITIES_REITS = [
+        # Utilities
+        "NEE", "DUK", "SO", "D", "AEP", "EXC", "SRE", "PEG", "XEL", "XLU",
+        # REITs
+        "AMT", "PLD", "CCI", "EQIX", "SPG", "O", "WELL", "DLR", "PSA", "EQR"
+    ]
+    CRYPTO_WATCHLIST = [
+        # Major Cryptos
+        "BTC-USD", "ETH-USD", "BNB-USD", "XRP-USD", "SOL-USD", "ADA-USD",
+        # DeFi/Alt coins  
+        "DOT-USD", "LINK-USD", "MATIC-USD", "AVAX-USD", "UNI-USD", "AAVE-USD",
+        # Layer 1s
+        "ATOM-USD", "ALGO-USD", "FTM-USD", "ONE-USD", "NEAR-USD", "FLOW-USD",
+        # Meme/Popular
+        "DOGE-USD", "SHIB-USD", "LTC-USD", "BCH-USD", "ETC-USD"
+    ]
+    INTERNATIONAL_ETFS = [
+        # Europe
+        "VGK", "EFA", "FEZ", "EWG", "EWU", "EWQ", "EWI", "EWP", "EWN", "EWD",
+        # Asia
+        "EWJ", "FXI", "EWH", "EWY", "EWT", "EWS", "INDA", "EPI", "EWZ", "EWC",
+        # Emerging Markets
+        "EEM", "VWO", "IEMG", "SCHE", "EEMV", "SPEM", "DEM", "DFEM", "HEEM"
+    ]
+    SECTOR_ETFS = [
+        # US Sector ETFs
+        "XLK", "XLF", "XLE", "XLV", "XLI", "XLP", "XLU", "XLB", "XLY", "XLRE",
+        # Thematic ETFs
+        "ARKK", "ARKQ", "ARKW", "ARKG", "ICLN", "PBW", "QCLN", "JETS", "SKYY", "ROBO"
+    ]
+    # COMBINE ALL WATCHLISTS (sin duplicados)
+    WATCHLIST = list(set(
+        US_LARGE_CAP + 
+        FINANCE_SECTOR + 
+        HEALTHCARE_BIOTECH + 
+        ENERGY_COMMODITIES + 
+        CONSUMER_RETAIL + 
+        INDUSTRIAL_DEFENSE + 
+        UTILITIES_REITS + 
+        CRYPTO_WATCHLIST +
+        INTERNATIONAL_ETFS + 
+        SECTOR_ETFS +
+        # Add your personal positions (always monitor)
+        ["NDAQ", "BNTX", "DFEN", "GLD", "XLU", "VOO", "SLV", "BTC-USD"]
+    ))
+
     def verify_portfolio_data(self):
         """Verify portfolio data is correct before trading"""
         print(f"\n🔍 PORTFOLIO VERIFICATION")
@@ -64,118 +172,16 @@ class AutomatedTrader:
         self.scan_interval = 1800  # 30 minutos
         self.update_interval = 300  # 5 minutos
         self.running = False
+        self._stop_event = threading.Event()  # Despierta el ciclo al detener
         self.last_scan = datetime.min
         self.last_update = datetime.min
-        # Watchlist de stocks populares
-        # EXPANDED WATCHLIST - 150+ symbols
-        self.us_large_cap = [
-            # FAANG + Big Tech
-            "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "META", "TSLA", "NVDA", "NFLX", "ADBE",
-            # Additional Tech
-            "CRM", "ORCL", "INTC", "AMD", "QCOM", "AVGO", "TXN", "MU", "AMAT", "LRCX",
-            "KLAC", "MRVL", "SWKS", "MCHP", "CTSH", "INFY", "ACN", "IBM", "HPQ", "DELL",
-            # Cloud/Software  
-            "NOW", "TEAM", "ZM", "DOCU", "CRWD", "ZS", "OKTA", "DDOG", "SNOW", "MDB",
-            # Semiconductors
-            "TSM", "ASML", "LAM", "KLAC", "AMAT", "TER", "MPWR", "MXIM", "ADI", "ON"
-        ]
-        self.finance_sector = [
-            # Banks
-            "JPM", "BAC", "WFC", "C", "GS", "MS", "USB", "PNC", "TFC", "COF",
-            # Insurance
-            "BRK-B", "AIG", "PGR", "TRV", "AXP", "ALL", "CB", "AON", "MMC", "MARSH",
-            # Financial Services
-            "V", "MA", "PYPL", "SQ", "COIN", "ICE", "CME", "NDAQ", "SPGI", "MCO",
-            "MSCI", "BLK", "SCHW", "TROW", "AMG", "BEN", "IVZ", "FDS"
-        ]
-        self.healthcare_biotech = [
-            # Big Pharma
-            "JNJ", "PFE", "ABBV", "MRK", "LLY", "BMY", "AMGN", "GILD", "BIIB", "REGN",
-            # Biotech
-            "MRNA", "BNTX", "NVAX", "VRTX", "CELG", "ILMN", "BMRN", "TECH", "SRPT", "BLUE",
-            # Medical Devices
-            "MDT", "ABT", "TMO", "DHR", "SYK", "BSX", "EW", "HOLX", "A", "ZBH",
-            # Healthcare Services
-            "UNH", "ANTM", "CVS", "CI", "HUM", "CNC", "MOH", "ELV", "VEEV"
-        ]
-        self.energy_commodities = [
-            # Oil & Gas
-            "XOM", "CVX", "COP", "EOG", "SLB", "HAL", "BKR", "NOV", "FTI", "HP",
-            # Renewables
-            "NEE", "ENPH", "SEDG", "FSLR", "SPWR", "RUN", "BE", "PLUG", "BALLARD",
-            # Commodities ETFs
-            "GLD", "SLV", "PDBC", "DBA", "USO", "UNG", "CPER", "JJN", "JJU", "JJG"
-        ]
-        self.consumer_retail = [
-            # Retail
-            "WMT", "HD", "TGT", "LOW", "COST", "TJX", "SBUX", "MCD", "CMG", "BKNG",
-            # Consumer Goods
-            "PG", "KO", "PEP", "NKE", "UL", "CL", "KMB", "GIS", "K", "CPB",
-            # Luxury/Discretionary
-            "LVMUY", "TPG", "RL", "COH", "KORS", "LULU", "DECK", "CROX", "ETSY"
-        ]
-        self.industrial_defense = [
-            # Aerospace/Defense
-            "BA", "LMT", "RTX", "NOC", "GD", "LHX", "HII", "LDOS", "DFEN",
-            # Industrial
-            "CAT", "DE", "MMM", "GE", "HON", "UPS", "FDX", "DAL", "UAL", "AAL",
-            # Materials
-            "FCX", "NEM", "GOLD", "AA", "X", "CLF", "STLD", "NUE", "MLM", "VMC"
-        ]
-        self.utilities_reits = [
-            # Utilities
-            "NEE", "DUK", "SO", "D", "AEP", "EXC", "SRE", "PEG", "XEL", "XLU",
-            # REITs
-            "AMT", "PLD", "CCI", "EQIX", "SPG", "O", "WELL", "DLR", "PSA", "EQR"
-        ]
-        self.crypto_watchlist = [
-            # Major Cryptos
-            "BTC-USD", "ETH-USD", "BNB-USD", "XRP-USD", "SOL-USD", "ADA-USD",
-            # DeFi/Alt coins  
-            "DOT-USD", "LINK-USD", "MATIC-USD", "AVAX-USD", "UNI-USD", "AAVE-USD",
-            # Layer 1s
-            "ATOM-USD", "ALGO-USD", "FTM-USD", "ONE-USD", "NEAR-USD", "FLOW-USD",
-            # Meme/Popular
-            "DOGE-USD", "SHIB-USD", "LTC-USD", "BCH-USD", "ETC-USD"
-        ]
-        self.international_etfs = [
-            # Europe
-            "VGK", "EFA", "FEZ", "EWG", "EWU", "EWQ", "EWI", "EWP", "EWN", "EWD",
-            # Asia
-            "EWJ", "FXI", "EWH", "EWY", "EWT", "EWS", "INDA", "EPI", "EWZ", "EWC",
-            # Emerging Markets
-            "EEM", "VWO", "IEMG", "SCHE", "EEMV", "SPEM", "DEM", "DFEM", "HEEM"
-        ]
-        self.sector_etfs = [
-            # US Sector ETFs
-            "XLK", "XLF", "XLE", "XLV", "XLI", "XLP", "XLU", "XLB", "XLY", "XLRE",
-            # Thematic ETFs
-            "ARKK", "ARKQ", "ARKW", "ARKG", "ICLN", "PBW", "QCLN", "JETS", "SKYY", "ROBO"
-        ]
-        # COMBINE ALL WATCHLISTS
-        self.watchlist = (
-            self.us_large_cap + 
-            self.finance_sector + 
-            self.healthcare_biotech + 
-            self.energy_commodities + 
-            self.consumer_retail + 
-            self.industrial_defense + 
-            self.utilities_reits + 
-            self.crypto_watchlist +
-            self.international_etfs + 
-            self.sector_etfs +
-            # Add your personal positions (always monitor)
-            ["NDAQ", "BNTX", "DFEN", "GLD", "XLU", "VOO", "SLV", "BTC-USD"]
-        )
-        # Remove duplicates
-        self.watchlist = list(set(self.watchlist))
-        print(f"✅ Expanded watchlist: {len(self.watchlist)} symbols")
-        print(f"   - US Large Cap: {len(self.us_large_cap)}")
-        print(f"   - Finance: {len(self.finance_sector)}")  
-        print(f"   - Healthcare/Biotech: {len(self.healthcare_biotech)}")
-        print(f"   - Energy/Commodities: {len(self.energy_commodities)}")
-        print(f"   - Crypto: {len(self.crypto_watchlist)}")
-        print(f"   - International: {len(self.international_etfs)}")
+        print(f"✅ Expanded watchlist: {len(self.WATCHLIST)} symbols")
+        print(f"   - US Large Cap: {len(self.US_LARGE_CAP)}")
+        print(f"   - Finance: {len(self.FINANCE_SECTOR)}")  
+        print(f"   - Healthcare/Biotech: {len(self.HEALTHCARE_BIOTECH)}")
+        print(f"   - Energy/Commodities: {len(self.ENERGY_COMMODITIES)}")
+        print(f"   - Crypto: {len(self.CRYPTO_WATCHLIST)}")
+        print(f"   - International: {len(self.INTERNATIONAL_ETFS)}")
         self.scanned_today = set()
         self.alerts_today = []
         print(f" AutomatedTrader inicializado")
@@ -187,26 +193,26 @@ class AutomatedTrader:
         # Weekend: Focus on crypto (24/7 markets)
         if now.weekday() >= 5:
             priority_list = (
-                self.crypto_watchlist + 
+                self.CRYPTO_WATCHLIST + 
                 list(self.position_manager.positions.keys()) +  # Always scan open positions
-                self.us_large_cap[:20]  # Top 20 stocks
+                self.US_LARGE_CAP[:20]  # Top 20 stocks
             )
         # Market hours: Full US focus
         elif 9 <= now.hour <= 16:  # US market hours (adjust for timezone)
             priority_list = (
                 list(self.position_manager.positions.keys()) +  # Always scan open positions
-                self.us_large_cap + 
-                self.finance_sector +
-                self.healthcare_biotech[:15] +
-                self.crypto_watchlist[:10]
+                self.US_LARGE_CAP + 
+                self.FINANCE_SECTOR +
+                self.HEALTHCARE_BIOTECH[:15] +
+                self.CRYPTO_WATCHLIST[:10]
             )
         # After hours: International + crypto
         else:
             priority_list = (
                 list(self.position_manager.positions.keys()) +
-                self.crypto_watchlist +
-                self.international_etfs[:20] +
-                self.us_large_cap[:30]
+                self.CRYPTO_WATCHLIST +
+                self.INTERNATIONAL_ETFS[:20] +
+                self.US_LARGE_CAP[:30]
             )
         return list(set(priority_list))  # Remove duplicates
 
@@ -260,44 +266,46 @@ class AutomatedTrader:
                 if 'error' in stock_data:
                     print(" Error")
                     continue
-                analysis = self.collector.analyze_stock_potential(stock_data)
                 tech_indicators = stock_data.get('technical_indicators', {})
                 price_data = stock_data.get('price_data', {})
                 # Cálculo de buy score
                 buy_score = 0
+                # (plantilla, valor): solo se formatean si hay señal de compra
                 buy_reasons = []
                 # RSI
                 rsi = tech_indicators.get('rsi')
                 if rsi and rsi < 35:
                     buy_score += 3
-                    buy_reasons.append(f"RSI oversold: {rsi:.1f}")
+                    buy_reasons.append(("RSI oversold: {:.1f}", rsi))
                 elif rsi and rsi < 45:
                     buy_score += 1
-                    buy_reasons.append(f"RSI favorable: {rsi:.1f}")
+                    buy_reasons.append(("RSI favorable: {:.1f}", rsi))
                 # MACD
                 macd = tech_indicators.get('macd')
                 macd_signal = tech_indicators.get('macd_signal')
                 if macd and macd_signal and macd > macd_signal:
                     buy_score += 2
-                    buy_reasons.append("MACD bullish crossover")
+                    buy_reasons.append(("MACD bullish crossover", None))
                 # Precio vs MA20
                 price_vs_ma20 = tech_indicators.get('price_vs_ma20', 0)
                 if -5 <= price_vs_ma20 <= 2:
                     buy_score += 2
-                    buy_reasons.append(f"Precio cerca MA20: {price_vs_ma20:+.1f}%")
+                    buy_reasons.append(("Precio cerca MA20: {:+.1f}%", price_vs_ma20))
                 # Volumen
                 volume_ratio = price_data.get('volume_ratio', 1)
                 if volume_ratio > 1.2:
                     buy_score += 1
-                    buy_reasons.append(f"Volumen alto: {volume_ratio:.1f}x")
-                # Análisis general
-                classification = analysis.get('classification', 'NEUTRAL')
-                if classification in ['BULLISH']:
-                    buy_score += 2
-                    buy_reasons.append("Análisis técnico bullish")
+                    buy_reasons.append(("Volumen alto: {:.1f}x", volume_ratio))
+                # Análisis general (incluye noticias): solo si aún puede decidir la compra
+                if buy_score + self.ANALYSIS_BONUS >= self.BUY_SCORE_THRESHOLD:
+                    analysis = self.collector.analyze_stock_potential(stock_data)
+                    classification = analysis.get('classification', 'NEUTRAL')
+                    if classification in ['BULLISH']:
+                        buy_score += self.ANALYSIS_BONUS
+                        buy_reasons.append(("Análisis técnico bullish", None))
                 scanned_count += 1
                 # Decisión de compra
-                if buy_score >= 5:
+                if buy_score >= self.BUY_SCORE_THRESHOLD:
                     current_price = price_data.get('current_price', 0)
                     company_name = stock_data.get('company_info', {}).get('name', symbol)
                     opportunity = {
@@ -305,7 +313,7 @@ class AutomatedTrader:
                         'company_name': company_name,
                         'current_price': current_price,
                         'buy_score': buy_score,
-                        'reasons': buy_reasons,
+                        'reasons': [template.format(value) for template, value in buy_reasons],
                         'timestamp': datetime.now().isoformat()
                     }
                     buy_opportunities.append(opportunity)
@@ -378,15 +386,13 @@ class AutomatedTrader:
         position = self.position_manager.positions[symbol]
         # Check notes for manual indicators
         if hasattr(position, 'notes') and position.notes:
-            manual_keywords = ["Real position", "Manual", "DEGIRO", "REVOLUT", "Real"]
-            if any(keyword in position.notes for keyword in manual_keywords):
+            if any(keyword in position.notes for keyword in self.MANUAL_KEYWORDS):
                 return True
         # Fallback: assume large positions or specific symbols are manual
         large_position_value = position.entry_price * position.quantity
         if large_position_value > 10000:
             return True
-        manual_symbols = ["BTC-USD", "NDAQ", "BNTX", "XAG-USD", "PPFB.L", "SXLE.MI", "DFEN", "VUSD.L"]
-        return symbol in manual_symbols
+        return symbol in self.MANUAL_SYMBOLS
 
     def update_positions(self):
         """Actualiza todas las posiciones abiertas (acciones y criptos) con protección para MANUAL"""
@@ -406,7 +412,7 @@ class AutomatedTrader:
                     continue
                 current_price = stock_data['price_data']['current_price']
                 self.position_manager.update_position(symbol, current_price)
-                decision, reasons = self.position_manager.analyze_position_decision(symbol)
+                decision, reasons = self.position_manager.analyze_position_decision(symbol, stock_data)
                 position = self.position_manager.positions[symbol]
                 pnl_color = "📈" if position.unrealized_pnl >= 0 else "📉"
                 print(f"{pnl_color} P&L: {position.unrealized_pnl_percent:+.1f}% | {decision.value}")
@@ -437,24 +443,16 @@ class AutomatedTrader:
 
     def send_alert(self, alert_type: str, symbol: str, message: str):
         """Sistema de notificaciones mejorado"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        emoji_map = {
-            "BUY_SIGNAL": "🎯",
-            "POSITION_OPENED": "📈", 
-            "SELL_IMMEDIATELY": "🔴",
-            "CONSIDER_SELL": "⚠️",
-            "PARTIAL_PROFIT": "💰",
-            "MANUAL_REVIEW": "👁️",
-            "MANUAL_REVIEW_URGENT": "🚨"
-        }
-        emoji = emoji_map.get(alert_type, "📊")
+        now = datetime.now()
+        timestamp = now.strftime("%H:%M:%S")
+        emoji = self.ALERT_EMOJIS.get(alert_type, "📊")
         alert_text = f"\n{emoji} {timestamp} | {symbol}: {message}"
         # Highlight manual position alerts
         if "MANUAL" in alert_type:
             alert_text = f"\n{'='*60}\n{alert_text}\n{'='*60}"
         print(alert_text)
         alert_record = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'type': alert_type,
             'symbol': symbol,
             'message': message
@@ -464,6 +462,7 @@ class AutomatedTrader:
     def start_automated_trading(self):
         """Inicia trading automatizado"""
         self.running = True
+        self._stop_event.clear()
         print(f"\n🔄 RELOADING PORTFOLIO FROM DATABASE...")
         self.position_manager.reload_from_database()
         reloaded = len(self.position_manager.positions)
@@ -474,6 +473,10 @@ class AutomatedTrader:
         print("=" * 60)
         print(f" Scan: {self.scan_interval/60:.0f} min | Update: {self.update_interval/60:.0f} min")
         print(f"\n Presiona Ctrl+C para detener")
+        # SIGTERM (p.ej. reenviado por el proceso padre en modo cloud): salir del ciclo sin esperar los 30s
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(signal.SIGTERM, self._handle_stop_signal)
         try:
             cycle_count = 0
             while self.running:
@@ -490,13 +493,33 @@ class AutomatedTrader:
                 if (now - self.last_update).total_seconds() >= self.update_interval:
                     self.update_positions()
                     self.last_update = now
-                time.sleep(30)  # Ciclo cada 30 segundos
+                self._wait_next_cycle(30)  # Ciclo cada 30 segundos (o antes si se detiene)
         except KeyboardInterrupt:
-            self.stop_trading()
+            pass
+        finally:
+            # No dejar el handler apuntando a este trader una vez terminado
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+        self.stop_trading()
+
+    def _wait_next_cycle(self, seconds: float):
+        """Espera entre ciclos en tramos de 1s para ver enseguida running=False puesto por el handler"""
+        deadline = time.monotonic() + seconds
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._stop_event.wait(min(1.0, remaining))
+
+    def _handle_stop_signal(self, signum, frame):
+        """Pide detener el ciclo; el cierre se hace fuera del handler"""
+        # Sin Event.set(): el handler corre en el hilo principal, que puede tener tomado el lock del Event en wait()
+        self.running = False
 
     def stop_trading(self):
         """Detiene el sistema"""
         self.running = False
+        self._stop_event.set()
         print(f"\n Sistema detenido")
         self.position_manager.print_portfolio_dashboard()
 
@@ -547,8 +570,8 @@ def main():
                 trader = AutomatedTrader()
                 trader.start_automated_trading()
             def run_dashboard():
-                import subprocess
-                subprocess.run([sys.executable, 'web_dashboard.py'])
+                from web_dashboard import run_server
+                run_server()
             p1 = Process(target=run_trader)
             p2 = Process(target=run_dashboard)
             p1.start()
@@ -584,12 +607,19 @@ if __name__ == "__main__":
             trader = AutomatedTrader()
             trader.start_automated_trading()
         def run_dashboard():
-            import subprocess
-            subprocess.run([sys.executable, 'web_dashboard.py'])
+            # En este mismo proceso: terminate() llega al servidor y no deja un hijo huérfano
+            from web_dashboard import run_server
+            run_server()
         p1 = Process(target=run_trader)
         p2 = Process(target=run_dashboard)
         p1.start()
         p2.start()
+        # docker stop solo avisa a este proceso (PID 1): reenviar SIGTERM a los hijos
+        def forward_stop_signal(signum, frame):
+            for process in (p1, p2):
+                if process.is_alive():
+                    process.terminate()
+        signal.signal(signal.SIGTERM, forward_stop_signal)
         p1.join()
         p2.join()
     else:
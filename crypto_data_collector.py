@@ -3,15 +3,43 @@
 CryptoDataCollector: Fetches crypto data and computes technical indicators (RSI, MACD, Bollinger Bands).
 Supports yfinance for BTC-USD, ETH-USD and CoinGecko API for altcoins.
 """
+import time
 import yfinance as yf
 import requests
 import pandas as pd
+import numpy as np
 
 class CryptoDataCollector:
-    def __init__(self):
+    def __init__(self, session=None):
+        self.session = session or requests.Session()
         self.coingecko_url = "https://api.coingecko.com/api/v3"
+        self.cache = {}  # {(symbol, period, interval): (timestamp, DataFrame)}
+        self.cache_ttl = 300  # 5 minutos
+        self.cache_max_entries = 256
+
+    def _get_cached(self, key):
+        # Copy: callers may add columns or fillna in place without touching the cached frame
+        if key in self.cache:
+            ts, data = self.cache[key]
+            if time.time() - ts < self.cache_ttl:
+                return data.copy()
+        return None
+
+    def _set_cached(self, key, data):
+        now = time.time()
+        # Evict expired entries, then the oldest ones if the cache is still full
+        # (re-inserting moves a key to the end, so dict order is oldest first)
+        self.cache.pop(key, None)
+        for old_key in [k for k, (ts, _) in self.cache.items() if now - ts >= self.cache_ttl]:
+            del self.cache[old_key]
+        while len(self.cache) >= self.cache_max_entries:
+            del self.cache[next(iter(self.cache))]
+        self.cache[key] = (now, data.copy())
 
     def get_yfinance_data(self, symbol, period="90d", interval="1h"):
+        cached = self._get_cached((symbol, period, interval))
+        if cached is not None:
+            return cached
         try:
             data = yf.download(symbol, period=period, interval=interval, progress=False, auto_adjust=True)
             if data.empty:
@@ -23,36 +51,79 @@ class CryptoDataCollector:
                 print(f"MultiIndex detected, flattening...")
                 data.columns = data.columns.droplevel(1)  # Remove ticker level
             print(f"After MultiIndex fix: {data.columns.tolist()}")
-            # Normalize column names (handle both 'Close' and 'close')
-            column_mapping = {}
-            for col in data.columns:
-                col_lower = col.lower().strip()
-                if 'close' in col_lower:
-                    column_mapping[col] = 'close'
-                elif 'open' in col_lower:
-                    column_mapping[col] = 'open'
-                elif 'high' in col_lower:
-                    column_mapping[col] = 'high'
-                elif 'low' in col_lower:
-                    column_mapping[col] = 'low'
-                elif 'volume' in col_lower:
-                    column_mapping[col] = 'volume'
-            data = data.rename(columns=column_mapping)
+            data = self._normalize_columns(data)
             print(f"After renaming: {data.columns.tolist()}")
             # Verify we have close column
             if 'close' not in data.columns:
                 print(f"Available columns: {data.columns.tolist()}")
                 raise KeyError(f"No 'close' column found after processing for {symbol}")
             print(f"Success! Close price sample: {data['close'].tail(3).values}")
-            return self._add_indicators(data)
+            data = self._add_indicators(data)
+            self._set_cached((symbol, period, interval), data)
+            return data
         except Exception as e:
             print(f"Error fetching {symbol}: {e}")
             return None
 
+    def get_yfinance_data_batch(self, symbols, period="90d", interval="1h"):
+        """
+        Downloads several tickers with a single yf.download call (symbols still in cache are skipped).
+        Returns {symbol: DataFrame with indicators}; symbols without data are omitted.
+        """
+        results = {}
+        missing = []
+        for symbol in symbols:
+            cached = self._get_cached((symbol, period, interval))
+            if cached is not None:
+                results[symbol] = cached
+            else:
+                missing.append(symbol)
+        symbols = missing
+        if not symbols:
+            return results
+        try:
+            data = yf.download(symbols, period=period, interval=interval, progress=False,
+                               auto_adjust=True, group_by="ticker")
+        except Exception as e:
+            print(f"Error fetching batch of {len(symbols)} symbols: {e}")
+            return results
+        if data.empty:
+            print(f"No data returned for batch of {len(symbols)} symbols")
+            return results
+        available = set(data.columns.get_level_values(0)) if isinstance(data.columns, pd.MultiIndex) else set()
+        for symbol in symbols:
+            if symbol not in available:
+                print(f"No data returned for {symbol}")
+                continue
+            df = self._normalize_columns(data[symbol].dropna(how="all").copy())
+            if df.empty or 'close' not in df.columns:
+                print(f"No data returned for {symbol}")
+                continue
+            results[symbol] = self._add_indicators(df)
+            self._set_cached((symbol, period, interval), results[symbol])
+        return results
+
+    def _normalize_columns(self, data):
+        # Normalize column names (handle both 'Close' and 'close')
+        column_mapping = {}
+        for col in data.columns:
+            col_lower = col.lower().strip()
+            if 'close' in col_lower:
+                column_mapping[col] = 'close'
+            elif 'open' in col_lower:
+                column_mapping[col] = 'open'
+            elif 'high' in col_lower:
+                column_mapping[col] = 'high'
+            elif 'low' in col_lower:
+                column_mapping[col] = 'low'
+            elif 'volume' in col_lower:
+                column_mapping[col] = 'volume'
+        return data.rename(columns=column_mapping)
+
     def get_coingecko_data(self, coin_id, days=90):
         url = f"{self.coingecko_url}/coins/{coin_id}/market_chart"
         params = {"vs_currency": "usd", "days": days}
-        resp = requests.get(url, params=params)
+        resp = self.session.get(url, params=params, timeout=10)
         if resp.status_code != 200:
             return None
         prices = resp.json().get("prices", [])
@@ -68,6 +139,8 @@ class CryptoDataCollector:
                 raise ValueError(f"Missing 'close' column. Available: {df.columns.tolist()}")
             if len(df) < 20:
                 print(f"Warning: Only {len(df)} rows, indicators may be incomplete")
+            # Missing indicators are NaN (not None) so columns stay float64 and
+            # consumers can mask them with a single isnan check
             # RSI (need at least 15 periods)
             if len(df) >= 15:
                 delta = df["close"].diff()
@@ -76,7 +149,7 @@ class CryptoDataCollector:
                 rs = gain / loss
                 df["rsi"] = 100 - (100 / (1 + rs))
             else:
-                df["rsi"] = None
+                df["rsi"] = np.nan
             # MACD (need at least 26 periods)
             if len(df) >= 26:
                 ema12 = df["close"].ewm(span=12, adjust=False).mean()
@@ -84,17 +157,19 @@ class CryptoDataCollector:
                 df["macd"] = ema12 - ema26
                 df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
             else:
-                df["macd"] = None
-                df["macd_signal"] = None
+                df["macd"] = np.nan
+                df["macd_signal"] = np.nan
             # Bollinger Bands (need at least 20 periods)
             if len(df) >= 20:
                 ma20 = df["close"].rolling(window=20).mean()
                 std20 = df["close"].rolling(window=20).std()
+                df["bb_middle"] = ma20
                 df["bb_upper"] = ma20 + 2 * std20
                 df["bb_lower"] = ma20 - 2 * std20
             else:
-                df["bb_upper"] = None
-                df["bb_lower"] = None
+                df["bb_middle"] = np.nan
+                df["bb_upper"] = np.nan
+                df["bb_lower"] = np.nan
             return df
         except Exception as e:
             print(f"Error calculating indicators: {e}")
@@ -8,10 +8,12 @@ Módulo base para obtener información técnica y fundamental de acciones
 import yfinance as yf
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import time
 import json
 from typing import Dict, List, Optional
+from bisect import bisect_right
 import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
@@ -32,12 +34,39 @@ except ImportError:
     print("TA-Lib not available, using manual calculations")
 
 class StockDataCollector:
-    def __init__(self):
-        self.session = requests.Session()
+    # score <= -5 STRONG_SELL, <= -3 SELL, <= -1 NEUTRAL_NEGATIVE, 0 NEUTRAL,
+    # >= 1 NEUTRAL_POSITIVE, >= 3 BUY, >= 5 STRONG_BUY
+    SCORE_THRESHOLDS = (-4, -2, 0, 1, 3, 5)
+    SCORE_CLASSIFICATIONS = ('STRONG_SELL', 'SELL', 'NEUTRAL_NEGATIVE', 'NEUTRAL',
+                             'NEUTRAL_POSITIVE', 'BUY', 'STRONG_BUY')
+    CRYPTO_SUFFIXES = ("-USD", "-USDT", "-EUR", "-BTC", "-ETH")
+    # CoinGecko usa ids tipo 'binancecoin' para BNB
+    COINGECKO_IDS = {"BNB-USD": "binancecoin", "BNB-EUR": "binancecoin"}
+    # Criptos que se descargan de yfinance; el resto va por CoinGecko
+    YFINANCE_CRYPTO = ("BTC-USD", "ETH-USD")
+    RECOMMENDATIONS = {
+        'STRONG_BUY': "🚀 COMPRA FUERTE - Múltiples señales técnicas muy positivas",
+        'BUY': "📈 COMPRA - Señales técnicas positivas dominantes",
+        'NEUTRAL_POSITIVE': "👀 VIGILAR DE CERCA - Algunas señales positivas",
+        'NEUTRAL': "⏸️ MANTENER EN WATCHLIST - Sin señales claras",
+        'NEUTRAL_NEGATIVE': "⚠️ PRECAUCIÓN - Algunas señales negativas",
+        'SELL': "📉 VENTA - Señales técnicas negativas dominantes",
+        'STRONG_SELL': "🔴 VENTA FUERTE - Múltiples señales técnicas muy negativas"
+    }
+
+    def __init__(self, session: Optional[requests.Session] = None):
+        # Una sola sesión keep-alive compartida con NewsAnalyzer y CryptoDataCollector
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.news_analyzer = NewsAnalyzer() if NEWS_ANALYZER_AVAILABLE else None
+        self.news_analyzer = NewsAnalyzer(session=self.session) if NEWS_ANALYZER_AVAILABLE else None
+        self._crypto_collector = None
     
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """
@@ -124,6 +153,85 @@ class StockDataCollector:
                 'lower': neutral_series
             }
     
+    def calculate_volatility(self, prices: pd.Series) -> float:
+        """
+        Calcula la volatilidad (desviación estándar de retornos simples, en %)
+        """
+        closes = prices.to_numpy(dtype=np.float64)
+        if not np.isfinite(closes).all():
+            # Con huecos, dejar que pandas ignore los NaN
+            return prices.pct_change().std() * 100
+        returns = np.diff(closes) / closes[:-1]
+        return returns.std(ddof=1) * 100 if returns.size > 1 else np.nan
+
+    @staticmethod
+    def _last_value(series: pd.Series) -> Optional[float]:
+        """
+        Último valor de una serie como float (None si está vacía o es NaN)
+        """
+        values = series.to_numpy()
+        if len(values) == 0 or pd.isna(values[-1]):
+            return None
+        return float(values[-1])
+
+    @classmethod
+    def _last_row(cls, df: pd.DataFrame, columns) -> Dict:
+        """
+        Extrae la última fila como dict de floats (None si falta la columna o es NaN)
+        """
+        return {col: cls._last_value(df[col]) if col in df.columns else None for col in columns}
+
+    def get_current_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Último precio de cierre de varios símbolos con una sola descarga (yf.download)
+        Los símbolos sin datos no aparecen en el resultado
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        try:
+            data = yf.download(symbols, period="5d", interval="1d", progress=False,
+                               auto_adjust=True, group_by="ticker")
+        except Exception as e:
+            print(f"Error descargando precios: {e}")
+            return {}
+        prices = {}
+        if data.empty:
+            return prices
+        for symbol in symbols:
+            try:
+                closes = data[symbol]['Close'].dropna()
+            except KeyError:
+                continue
+            if len(closes) > 0:
+                prices[symbol] = float(closes.iloc[-1])
+        return prices
+
+    def _get_crypto_collector(self):
+        """CryptoDataCollector compartido; se importa solo si hace falta (None si no está)"""
+        if self._crypto_collector is None:
+            try:
+                from crypto_data_collector import CryptoDataCollector
+            except ImportError:
+                return None
+            self._crypto_collector = CryptoDataCollector(session=self.session)
+        return self._crypto_collector
+
+    def is_crypto(self, symbol: str) -> bool:
+        return symbol.upper().endswith(self.CRYPTO_SUFFIXES)
+
+    def prefetch_crypto_data(self, symbols: List[str]):
+        """
+        Descarga con un solo yf.download las criptos de yfinance de la lista
+        get_stock_data las sirve después desde la caché de CryptoDataCollector
+        """
+        yf_symbols = [symbol for symbol in symbols if symbol.upper() in self.YFINANCE_CRYPTO]
+        if not yf_symbols:
+            return
+        crypto_collector = self._get_crypto_collector()
+        if crypto_collector is not None:
+            crypto_collector.get_yfinance_data_batch(yf_symbols, period="90d", interval="1d")
+
     def get_stock_data(self, symbol: str, period: str = "6mo") -> Dict:
         """
         Obtiene datos completos de una acción o cripto
@@ -131,65 +239,63 @@ class StockDataCollector:
         """
         try:
             # Detectar si es cripto
-            is_crypto = False
-            crypto_suffixes = ["-USD", "-USDT", "-EUR", "-BTC", "-ETH"]
-            for suf in crypto_suffixes:
-                if symbol.upper().endswith(suf):
-                    is_crypto = True
-                    break
-            if is_crypto:
-                # Importar solo si es necesario
-                try:
-                    from crypto_data_collector import CryptoDataCollector
-                except ImportError:
+            if self.is_crypto(symbol):
+                crypto_collector = self._get_crypto_collector()
+                if crypto_collector is None:
                     return {'symbol': symbol, 'error': 'CryptoDataCollector not found', 'timestamp': datetime.now().isoformat()}
-                crypto_collector = CryptoDataCollector()
                 # yfinance para BTC-USD, ETH-USD, etc. CoinGecko para otros
-                if symbol.upper() in ["BTC-USD", "ETH-USD"]:
+                if symbol.upper() in self.YFINANCE_CRYPTO:
                     df = crypto_collector.get_yfinance_data(symbol, period="90d", interval="1d")
                 else:
-                    # CoinGecko usa ids tipo 'binancecoin' para BNB
-                    coingecko_map = {"BNB-USD": "binancecoin", "BNB-EUR": "binancecoin"}
-                    coin_id = coingecko_map.get(symbol.upper(), symbol.split("-")[0].lower())
+                    coin_id = self.COINGECKO_IDS.get(symbol.upper(), symbol.split("-")[0].lower())
                     df = crypto_collector.get_coingecko_data(coin_id, days=90)
                 if df is None or len(df) == 0:
                     return {'symbol': symbol, 'error': 'No crypto data', 'timestamp': datetime.now().isoformat()}
-                # Usar la última fila
-                last = df.iloc[-1]
-                prev = df.iloc[-2] if len(df) > 1 else last
+                # Usar la última fila, extraída una sola vez
+                last = self._last_row(df, ('close', 'volume', 'rsi', 'macd', 'macd_signal', 'bb_upper', 'bb_middle', 'bb_lower'))
+                close = last['close']
+                closes = df['close'].to_numpy()
+                volumes = df['volume'].to_numpy() if 'volume' in df.columns else None
+                avg_volume = np.nanmean(volumes[-30:]) if volumes is not None else None
+                prev_close = float(closes[-2]) if len(closes) > 1 else close
+                rsi, macd, macd_signal = last['rsi'], last['macd'], last['macd_signal']
+                bb_upper, bb_lower = last['bb_upper'], last['bb_lower']
+                ma_20 = last['bb_middle']  # MA20 precalculada en _add_indicators
+                has_macd = macd is not None and macd_signal is not None
+                has_bb = bb_upper is not None and bb_lower is not None
                 # Estructura compatible con acciones
                 result = {
                     'symbol': symbol,
                     'timestamp': datetime.now().isoformat(),
                     'price_data': {
-                        'current_price': round(last['close'], 4),
-                        'prev_close': round(prev['close'], 4),
-                        'change': round(last['close'] - prev['close'], 4),
-                        'change_percent': round(((last['close'] - prev['close']) / prev['close']) * 100, 4) if prev['close'] else 0,
-                        'day_high': round(df['close'][-10:].max(), 4),
-                        'day_low': round(df['close'][-10:].min(), 4),
-                        'volume': int(last['volume']) if 'volume' in last and not pd.isna(last['volume']) else None,
-                        'avg_volume': int(df['volume'][-30:].mean()) if 'volume' in df.columns else None,
-                        'volume_ratio': round((last['volume'] / df['volume'][-30:].mean()), 2) if 'volume' in df.columns and df['volume'][-30:].mean() > 0 else 1
+                        'current_price': round(close, 4),
+                        'prev_close': round(prev_close, 4),
+                        'change': round(close - prev_close, 4),
+                        'change_percent': round(((close - prev_close) / prev_close) * 100, 4) if prev_close else 0,
+                        'day_high': round(np.nanmax(closes[-10:]), 4),
+                        'day_low': round(np.nanmin(closes[-10:]), 4),
+                        'volume': int(last['volume']) if last['volume'] is not None else None,
+                        'avg_volume': int(avg_volume) if avg_volume is not None else None,
+                        'volume_ratio': round((last['volume'] / avg_volume), 2) if last['volume'] is not None and avg_volume > 0 else 1
                     },
                     'technical_indicators': {
-                        'ma_20': round(df['close'][-20:].mean(), 4) if len(df) >= 20 else None,
-                        'ma_50': round(df['close'][-50:].mean(), 4) if len(df) >= 50 else None,
-                        'price_vs_ma20': round(((last['close'] / df['close'][-20:].mean()) - 1) * 100, 4) if len(df) >= 20 else None,
-                        'volatility_30d': round(df['close'][-30:].pct_change().std() * 100, 4) if len(df) >= 30 else None,
-                        'rsi': round(last['rsi'], 2) if 'rsi' in last and not pd.isna(last['rsi']) else None,
+                        'ma_20': round(ma_20, 4) if ma_20 is not None else None,
+                        'ma_50': round(np.nanmean(closes[-50:]), 4) if len(closes) >= 50 else None,
+                        'price_vs_ma20': round(((close / ma_20) - 1) * 100, 4) if ma_20 else None,
+                        'volatility_30d': round(self.calculate_volatility(df['close'][-30:]), 4) if len(df) >= 30 else None,
+                        'rsi': round(rsi, 2) if rsi is not None else None,
                         'macd': {
-                            'macd_line': round(last['macd'], 4) if 'macd' in last and not pd.isna(last['macd']) else None,
-                            'signal_line': round(last['macd_signal'], 4) if 'macd_signal' in last and not pd.isna(last['macd_signal']) else None,
-                            'histogram': round((last['macd'] - last['macd_signal']), 4) if 'macd' in last and 'macd_signal' in last and not pd.isna(last['macd']) and not pd.isna(last['macd_signal']) else None,
-                            'bullish_crossover': (last['macd'] > last['macd_signal']) if 'macd' in last and 'macd_signal' in last and not pd.isna(last['macd']) and not pd.isna(last['macd_signal']) else None
+                            'macd_line': round(macd, 4) if macd is not None else None,
+                            'signal_line': round(macd_signal, 4) if macd_signal is not None else None,
+                            'histogram': round(macd - macd_signal, 4) if has_macd else None,
+                            'bullish_crossover': macd > macd_signal if has_macd else None
                         },
                         'bollinger_bands': {
-                            'upper': round(last['bb_upper'], 4) if 'bb_upper' in last and not pd.isna(last['bb_upper']) else None,
-                            'middle': round(df['close'][-20:].mean(), 4) if len(df) >= 20 else None,
-                            'lower': round(last['bb_lower'], 4) if 'bb_lower' in last and not pd.isna(last['bb_lower']) else None,
-                            'position': round(((last['close'] - last['bb_lower']) / (last['bb_upper'] - last['bb_lower'])), 4) if 'bb_upper' in last and 'bb_lower' in last and not pd.isna(last['bb_upper']) and not pd.isna(last['bb_lower']) and (last['bb_upper'] - last['bb_lower']) > 0 else None,
-                            'squeeze': abs(last['bb_upper'] - last['bb_lower']) / df['close'][-20:].mean() < 0.1 if 'bb_upper' in last and 'bb_lower' in last and not pd.isna(last['bb_upper']) and not pd.isna(last['bb_lower']) and len(df) >= 20 and df['close'][-20:].mean() != 0 else None
+                            'upper': round(bb_upper, 4) if bb_upper is not None else None,
+                            'middle': round(ma_20, 4) if ma_20 is not None else None,
+                            'lower': round(bb_lower, 4) if bb_lower is not None else None,
+                            'position': round((close - bb_lower) / (bb_upper - bb_lower), 4) if has_bb and (bb_upper - bb_lower) > 0 else None,
+                            'squeeze': abs(bb_upper - bb_lower) / ma_20 < 0.1 if has_bb and ma_20 else None
                         }
                     },
                     'fundamental_data': {},
@@ -221,15 +327,15 @@ class StockDataCollector:
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1
             # Indicadores técnicos avanzados
             rsi = self.calculate_rsi(hist['Close'])
-            current_rsi = rsi.iloc[-1] if len(rsi) > 0 and not pd.isna(rsi.iloc[-1]) else None
+            current_rsi = self._last_value(rsi)
             macd_data = self.calculate_macd(hist['Close'])
-            current_macd = macd_data['macd'].iloc[-1] if len(macd_data['macd']) > 0 and not pd.isna(macd_data['macd'].iloc[-1]) else None
-            current_macd_signal = macd_data['signal'].iloc[-1] if len(macd_data['signal']) > 0 and not pd.isna(macd_data['signal'].iloc[-1]) else None
-            current_macd_hist = macd_data['histogram'].iloc[-1] if len(macd_data['histogram']) > 0 and not pd.isna(macd_data['histogram'].iloc[-1]) else None
+            current_macd = self._last_value(macd_data['macd'])
+            current_macd_signal = self._last_value(macd_data['signal'])
+            current_macd_hist = self._last_value(macd_data['histogram'])
             bb_data = self.calculate_bollinger_bands(hist['Close'])
-            current_bb_upper = bb_data['upper'].iloc[-1] if len(bb_data['upper']) > 0 and not pd.isna(bb_data['upper'].iloc[-1]) else None
-            current_bb_middle = bb_data['middle'].iloc[-1] if len(bb_data['middle']) > 0 and not pd.isna(bb_data['middle'].iloc[-1]) else None
-            current_bb_lower = bb_data['lower'].iloc[-1] if len(bb_data['lower']) > 0 and not pd.isna(bb_data['lower'].iloc[-1]) else None
+            current_bb_upper = self._last_value(bb_data['upper'])
+            current_bb_middle = self._last_value(bb_data['middle'])
+            current_bb_lower = self._last_value(bb_data['lower'])
             # Calcular posición dentro de las Bollinger Bands
             bb_position = None
             if current_bb_upper and current_bb_lower:
@@ -253,7 +359,7 @@ class StockDataCollector:
                     'ma_20': round(ma_20, 2) if ma_20 else None,
                     'ma_50': round(ma_50, 2) if ma_50 else None,
                     'price_vs_ma20': round(((current_price / ma_20) - 1) * 100, 2) if ma_20 else None,
-                    'volatility_30d': round(recent_data['Close'].pct_change().std() * 100, 2),
+                    'volatility_30d': round(self.calculate_volatility(recent_data['Close']), 2),
                     # Nuevos indicadores técnicos avanzados
                     'rsi': round(current_rsi, 2) if current_rsi else None,
                     'macd': {
@@ -483,21 +589,8 @@ class StockDataCollector:
             classification = "SELL"
             signals.append("❗ SELL - Negative news overrides technicals")
         else:
-            # Clasificación final mejorada
-            if score >= 5:
-                classification = "STRONG_BUY"
-            elif score >= 3:
-                classification = "BUY"
-            elif score >= 1:
-                classification = "NEUTRAL_POSITIVE"
-            elif score <= -5:
-                classification = "STRONG_SELL"
-            elif score <= -3:
-                classification = "SELL"
-            elif score <= -1:
-                classification = "NEUTRAL_NEGATIVE"
-            else:
-                classification = "NEUTRAL"
+            # Clasificación final mejorada (tabla de umbrales sobre el score entero)
+            classification = self.SCORE_CLASSIFICATIONS[bisect_right(self.SCORE_THRESHOLDS, score)]
 
         return {
             'score': score,
@@ -552,16 +645,7 @@ class StockDataCollector:
     
     def _get_recommendation(self, classification: str) -> str:
         """Genera recomendación basada en la clasificación mejorada"""
-        recommendations = {
-            'STRONG_BUY': "🚀 COMPRA FUERTE - Múltiples señales técnicas muy positivas",
-            'BUY': "📈 COMPRA - Señales técnicas positivas dominantes",
-            'NEUTRAL_POSITIVE': "👀 VIGILAR DE CERCA - Algunas señales positivas",
-            'NEUTRAL': "⏸️ MANTENER EN WATCHLIST - Sin señales claras",
-            'NEUTRAL_NEGATIVE': "⚠️ PRECAUCIÓN - Algunas señales negativas",
-            'SELL': "📉 VENTA - Señales técnicas negativas dominantes", 
-            'STRONG_SELL': "🔴 VENTA FUERTE - Múltiples señales técnicas muy negativas"
-        }
-        return recommendations.get(classification, "🤔 Análisis inconcluso")
+        return self.RECOMMENDATIONS.get(classification, "🤔 Análisis inconcluso")
 
 
 def main():
@@ -3,6 +3,18 @@ import os
 import csv
 from datetime import datetime
 from typing import List, Dict, Any
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Los precios del collector llegan como escalares NumPy; sqlite3 no sabe enlazarlos
+if np is not None:
+    sqlite3.register_adapter(np.float64, float)
+    sqlite3.register_adapter(np.float32, float)
+    sqlite3.register_adapter(np.int64, int)
+    sqlite3.register_adapter(np.int32, int)
+    sqlite3.register_adapter(np.bool_, bool)
 
 class DatabaseManager:
     def __init__(self, db_path: str = "trading.db"):
@@ -29,6 +41,9 @@ class DatabaseManager:
             notes TEXT,
             position_type TEXT DEFAULT 'AUTO'
         )''')
+        # Índice no único: un símbolo puede tener varias filas (p.ej. una MANUAL y otra AUTO)
+        c.execute('DROP INDEX IF EXISTS ux_positions_symbol')
+        c.execute('CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)')
         c.execute('''CREATE TABLE IF NOT EXISTS trades_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             symbol TEXT,
@@ -49,12 +64,31 @@ class DatabaseManager:
         )''')
         self.conn.commit()
 
+    POSITION_COLUMNS = ('symbol', 'entry_date', 'entry_price', 'quantity', 'stop_loss', 'take_profit', 'current_price', 'unrealized_pnl', 'unrealized_pnl_percent', 'days_held', 'trailing_stop', 'partial_sold', 'notes', 'position_type')
+    INSERT_POSITION_SQL = f"INSERT INTO positions ({', '.join(POSITION_COLUMNS)}) VALUES ({', '.join('?' * len(POSITION_COLUMNS))})"
+    UPDATE_POSITION_SQL = f"UPDATE positions SET {', '.join(f'{col}=?' for col in POSITION_COLUMNS[1:])} WHERE symbol=?"
+    INSERT_MISSING_POSITION_SQL = f"INSERT INTO positions ({', '.join(POSITION_COLUMNS)}) SELECT {', '.join('?' * len(POSITION_COLUMNS))} WHERE NOT EXISTS (SELECT 1 FROM positions WHERE symbol=?)"
+    SELECT_POSITIONS_SQL = f"SELECT {', '.join(POSITION_COLUMNS)} FROM positions"
+
+    @staticmethod
+    def _position_row(pos: Dict[str, Any]) -> tuple:
+        return (pos['symbol'], pos['entry_date'], pos['entry_price'], pos['quantity'], pos['stop_loss'], pos['take_profit'], pos.get('current_price', 0), pos.get('unrealized_pnl', 0), pos.get('unrealized_pnl_percent', 0), pos.get('days_held', 0), pos.get('trailing_stop', 0), int(pos.get('partial_sold', False)), pos.get('notes', ''), pos.get('position_type', 'AUTO'))
+
     def save_position(self, pos: Dict[str, Any]):
-        c = self.conn.cursor()
-        c.execute('''INSERT INTO positions (symbol, entry_date, entry_price, quantity, stop_loss, take_profit, current_price, unrealized_pnl, unrealized_pnl_percent, days_held, trailing_stop, partial_sold, notes, position_type)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (pos['symbol'], pos['entry_date'], pos['entry_price'], pos['quantity'], pos['stop_loss'], pos['take_profit'], pos.get('current_price', 0), pos.get('unrealized_pnl', 0), pos.get('unrealized_pnl_percent', 0), pos.get('days_held', 0), pos.get('trailing_stop', 0), int(pos.get('partial_sold', False)), pos.get('notes', ''), pos.get('position_type', 'AUTO')))
-        self.conn.commit()
+        """Inserta la posición; no toca otras filas del mismo símbolo (p.ej. una MANUAL)"""
+        with self.conn:
+            self.conn.execute(self.INSERT_POSITION_SQL, self._position_row(pos))
+
+    def save_positions(self, positions: List[Dict[str, Any]]) -> int:
+        """
+        Actualiza por símbolo o inserta varias posiciones en una sola transacción (un único commit)
+        Pensado para sync_database: sobrescribe las filas existentes de esos símbolos
+        """
+        rows = [self._position_row(pos) for pos in positions]
+        with self.conn:
+            self.conn.executemany(self.UPDATE_POSITION_SQL, [row[1:] + (row[0],) for row in rows])
+            self.conn.executemany(self.INSERT_MISSING_POSITION_SQL, [row + (row[0],) for row in rows])
+        return len(rows)
 
     def update_position(self, pos: Dict[str, Any]):
         c = self.conn.cursor()
@@ -80,11 +114,9 @@ class DatabaseManager:
         self.conn.commit()
 
     def load_positions(self) -> List[Dict[str, Any]]:
-        c = self.conn.cursor()
-        c.execute('SELECT * FROM positions')
-        rows = c.fetchall()
-        columns = [desc[0] for desc in c.description]
-        return [dict(zip(columns, row)) for row in rows]
+        # Solo las columnas que reconstruye Position (sin el id interno)
+        rows = self.conn.execute(self.SELECT_POSITIONS_SQL).fetchall()
+        return [dict(zip(self.POSITION_COLUMNS, row)) for row in rows]
 
     def export_trades_history_csv(self, filename: str = None):
         if not filename:
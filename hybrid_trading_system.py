@@ -4,18 +4,11 @@ Hybrid Trading System - Stocks + Crypto
 Sistema principal que analiza tanto acciones como criptomonedas
 """
 
-import time
+import asyncio
 from datetime import datetime
-import importlib.util
 
 # Import existing modules
-def import_data_collector():
-    spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-    data_collector = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(data_collector)
-    return data_collector
-
-data_collector = import_data_collector()
+from data_collector import StockDataCollector
 from position_manager import PositionManager
 from crypto_data_collector import CryptoDataCollector
 from unified_trader import UnifiedTrader
@@ -26,8 +19,8 @@ class HybridTradingSystem:
         print("🚀 INITIALIZING HYBRID TRADING SYSTEM")
         print("=" * 60)
         # Initialize collectors
-        self.stock_collector = data_collector.StockDataCollector()
-        self.crypto_collector = CryptoDataCollector()
+        self.stock_collector = StockDataCollector()
+        self.crypto_collector = CryptoDataCollector(session=self.stock_collector.session)
         self.position_manager = PositionManager(self.stock_collector)
         # Initialize unified trader
         self.unified_trader = UnifiedTrader(
@@ -92,6 +85,9 @@ class HybridTradingSystem:
         return opportunities
     def run_continuous_monitoring(self, cycles=5, interval_minutes=10):
         """Run continuous monitoring for testing"""
+        asyncio.run(self.run_continuous_monitoring_async(cycles, interval_minutes))
+    async def run_continuous_monitoring_async(self, cycles=5, interval_minutes=10):
+        """Continuous monitoring on an event loop: cycles run inline (Ctrl+C stops them at once), waits don't block"""
         print(f"\n🔄 CONTINUOUS MONITORING")
         print(f"Cycles: {cycles} | Interval: {interval_minutes} min")
         print("=" * 60)
@@ -109,7 +105,7 @@ class HybridTradingSystem:
                     print(f"  {signal['symbol']} | Score: {signal['score']} | Action: POTENTIAL BUY")
             if i < cycles - 1:  # Don't sleep on last cycle
                 print(f"\n⏳ Waiting {interval_minutes} minutes for next cycle...")
-                time.sleep(interval_minutes * 60)
+                await asyncio.sleep(interval_minutes * 60)
         print(f"\n✅ Continuous monitoring completed!")
 def main():
     """Main execution"""
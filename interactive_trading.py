@@ -4,17 +4,17 @@ Interactive Position Manager - Sistema interactivo de gestión
 """
 
 import sys
-import importlib.util
+import asyncio
 from datetime import datetime
+from itertools import islice
 
-# Import data-collector.py
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-StockDataCollector = data_collector.StockDataCollector
-
+from data_collector import StockDataCollector
+import price_cache
 from position_manager import PositionManager, PositionDecision
 
+# get_stock_data de acciones comparte la Session de requests (pool de 32); pocas a la vez
+MAX_CONCURRENT_FETCHES = 4
+
 def main_menu():
     """Menú principal interactivo"""
     collector = StockDataCollector()
@@ -119,12 +119,40 @@ def open_new_position(manager, collector):
             
             # Mostrar análisis inmediato
             manager.update_position(symbol, current_price)
-            decision, reasons = manager.analyze_position_decision(symbol)
+            decision, reasons = manager.analyze_position_decision(symbol, stock_data)
             print(f" Análisis inicial: {decision.value}")
             
     except ValueError:
         print(" Error en los valores ingresados")
 
+async def fetch_stock_data_concurrently(collector, symbols):
+    """Descarga datos de varios símbolos en paralelo (get_stock_data es bloqueante)"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+    async def fetch_one(symbol):
+        async with semaphore:
+            return symbol, await asyncio.to_thread(price_cache.get, collector, symbol)
+
+    return dict(await asyncio.gather(*[fetch_one(symbol) for symbol in symbols]))
+
+def fetch_positions_data(collector, symbols):
+    """
+    Datos de todas las posiciones: acciones en paralelo, criptos en serie
+    Las criptos que no están en la caché de disco se bajan antes con un solo yf.download
+    """
+    crypto = [symbol for symbol in symbols if collector.is_crypto(symbol)]
+    stocks = [symbol for symbol in symbols if not collector.is_crypto(symbol)]
+    data = asyncio.run(fetch_stock_data_concurrently(collector, stocks)) if stocks else {}
+    for symbol in crypto:
+        cached = price_cache.get_cached(symbol)
+        if cached is not None:
+            data[symbol] = cached
+    missing = [symbol for symbol in crypto if symbol not in data]
+    collector.prefetch_crypto_data(missing)
+    for symbol in missing:
+        data[symbol] = price_cache.get(collector, symbol)
+    return {symbol: data[symbol] for symbol in symbols}
+
 def update_all_positions_interactive(manager):
     """Actualiza posiciones con feedback detallado"""
     if not manager.positions:
@@ -133,11 +161,12 @@ def update_all_positions_interactive(manager):
     
     decisions_count = {decision.value: 0 for decision in PositionDecision}
     
-    for symbol in manager.positions.keys():
+    # Obtener datos actuales de todas las posiciones a la vez
+    all_stock_data = fetch_positions_data(manager.stock_collector, list(manager.positions.keys()))
+    
+    for symbol, stock_data in all_stock_data.items():
         print(f"\n Analizando {symbol}...")
         
-        # Obtener datos actuales
-        stock_data = manager.stock_collector.get_stock_data(symbol)
         if 'error' in stock_data:
             print(f"    Error obteniendo datos")
             continue
@@ -145,7 +174,7 @@ def update_all_positions_interactive(manager):
         current_price = stock_data['price_data']['current_price']
         manager.update_position(symbol, current_price)
         
-        decision, reasons = manager.analyze_position_decision(symbol)
+        decision, reasons = manager.analyze_position_decision(symbol, stock_data)
         decisions_count[decision.value] += 1
         
         position = manager.positions[symbol]
@@ -170,6 +199,13 @@ def update_all_positions_interactive(manager):
             icon = "" if "HOLD" in decision else "" if "CONSIDER" in decision else ""
             print(f"   {icon} {decision}: {count} posiciones")
 
+def get_position_symbol(manager, choice):
+    """Símbolo de la posición elegida en el menú (1-based) sin copiar las claves"""
+    symbol = next(islice(manager.positions, choice - 1, None), None) if choice >= 1 else None
+    if symbol is None:
+        raise IndexError(f"Posición fuera de rango: {choice}")
+    return symbol
+
 def analyze_single_position(manager):
     """Análisis detallado de una posición específica"""
     if not manager.positions:
@@ -177,13 +213,12 @@ def analyze_single_position(manager):
         return
     
     print(f"\nPosiciones disponibles:")
-    for i, symbol in enumerate(manager.positions.keys(), 1):
-        pos = manager.positions[symbol]
+    for i, (symbol, pos) in enumerate(manager.positions.items(), 1):
         print(f"{i}. {symbol} - P&L: ${pos.unrealized_pnl:.2f}")
     
     try:
         choice = int(input(f"\nSelecciona posición (1-{len(manager.positions)}): "))
-        symbol = list(manager.positions.keys())[choice - 1]
+        symbol = get_position_symbol(manager, choice)
         
         print(f"\n ANÁLISIS DETALLADO: {symbol}")
         print("-" * 40)
@@ -198,7 +233,7 @@ def analyze_single_position(manager):
         manager.update_position(symbol, current_price)
         
         position = manager.positions[symbol]
-        decision, reasons = manager.analyze_position_decision(symbol)
+        decision, reasons = manager.analyze_position_decision(symbol, stock_data)
         
         # Mostrar detalles completos
         print(f" Posición: {position.quantity} acciones")
@@ -238,7 +273,7 @@ def close_position_interactive(manager):
     
     try:
         choice = int(input(f"\nSelecciona posición a cerrar (1-{len(manager.positions)}): "))
-        symbol = list(manager.positions.keys())[choice - 1]
+        symbol = get_position_symbol(manager, choice)
         
         reason = input(f"Razón para cerrar (opcional): ").strip() or "Manual close"
         
@@ -8,7 +8,8 @@ except ImportError:
     TextBlob = None
 
 class NewsAnalyzer:
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
+        self.session = session or requests.Session()
         self.cache = {}  # {symbol: (timestamp, sentiment)}
         self.cache_ttl = 3600  # 1 hora
 
@@ -33,7 +34,7 @@ class NewsAnalyzer:
     def _fetch_yahoo_news(self, symbol: str):
         url = f"https://finance.yahoo.com/quote/{symbol}/news?p={symbol}"
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = self.session.get(url, headers=headers, timeout=10)
         if resp.status_code != 200:
             return []
         # Simple scraping: busca títulos de noticias
@@ -187,36 +187,39 @@ class PositionManager:
             except Exception as e:
                 print(f"[DB WARNING] No se pudo guardar snapshot diario: {e}")
     
-    def analyze_position_decision(self, symbol: str) -> Tuple[PositionDecision, List[str]]:
-        """Analiza una posición y decide acción"""
+    def analyze_position_decision(self, symbol: str, stock_data: Optional[Dict] = None) -> Tuple[PositionDecision, List[str]]:
+        """Analiza una posición y decide acción. Reutiliza stock_data si el llamador ya lo obtuvo"""
         if symbol not in self.positions:
             return PositionDecision.HOLD_CAUTIOUS, ["Posición no encontrada"]
         
         position = self.positions[symbol]
-        stock_data = self.stock_collector.get_stock_data(symbol)
-        
-        if 'error' in stock_data:
-            return PositionDecision.HOLD_CAUTIOUS, ["Error obteniendo datos"]
-        
-        analysis = self.stock_collector.analyze_stock_potential(stock_data)
-        tech_indicators = stock_data.get('technical_indicators', {})
-        
-        rsi = tech_indicators.get('rsi')
-        reasons = []
-        score = 0
-        
+
+        # Reglas de salida: solo comparaciones sobre la posición, antes de pedir datos
         # Stop Loss Hit
         if position.current_price <= position.trailing_stop:
             return PositionDecision.SELL_IMMEDIATELY, ["Stop loss activado"]
-        
-        # Take Profit Hit  
+
+        # Take Profit Hit
         if position.current_price >= position.take_profit:
             return PositionDecision.SELL_IMMEDIATELY, ["Take profit alcanzado"]
-        
+
         # Profit Parcial >7%
         if position.unrealized_pnl_percent > 7 and not position.partial_sold:
             return PositionDecision.TAKE_PARTIAL_PROFIT, ["Ganancia >7% - vender 50%"]
-        
+
+        if stock_data is None:
+            stock_data = self.stock_collector.get_stock_data(symbol)
+
+        if 'error' in stock_data:
+            return PositionDecision.HOLD_CAUTIOUS, ["Error obteniendo datos"]
+
+        analysis = self.stock_collector.analyze_stock_potential(stock_data)
+        tech_indicators = stock_data.get('technical_indicators', {})
+
+        rsi = tech_indicators.get('rsi')
+        reasons = []
+        score = 0
+
         # Análisis técnico
         if rsi and rsi > 80:
             score -= 3
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Price Cache - Caché en disco de corta duración para get_stock_data
+Evita repetir la descarga del mismo símbolo entre scripts lanzados seguidos
+"""
+
+import os
+import json
+import time
+import tempfile
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "prices")
+DEFAULT_TTL = 60  # segundos
+
+def _cache_path(symbol: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in symbol)
+    return os.path.join(CACHE_DIR, f"{safe}.json")
+
+def _to_builtin(value):
+    # Escalares NumPy -> tipos de Python; cualquier otra cosa como texto
+    return value.item() if hasattr(value, "item") else str(value)
+
+def _write(path: str, data: dict):
+    tmp = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "data": data}, f, default=_to_builtin)
+        os.replace(tmp, path)  # Atómico: un lector nunca ve el fichero a medias
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[CACHE WARNING] No se pudo guardar {path}: {e}")
+        if tmp and os.path.exists(tmp):
+            os.remove(tmp)
+
+def get_cached(symbol: str, ttl: float = DEFAULT_TTL):
+    """Datos guardados en disco para symbol si tienen menos de ttl segundos; None si no"""
+    try:
+        with open(_cache_path(symbol), encoding="utf-8") as f:
+            entry = json.load(f)
+        if time.time() - entry["ts"] < ttl:
+            return entry["data"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+def get(collector, symbol: str, ttl: float = DEFAULT_TTL) -> dict:
+    """Devuelve get_stock_data(symbol) desde disco si tiene menos de ttl segundos"""
+    data = get_cached(symbol, ttl)
+    if data is not None:
+        return data
+    data = collector.get_stock_data(symbol)
+    if 'error' not in data:
+        _write(_cache_path(symbol), data)
+    return data
@@ -6,12 +6,9 @@ Script to add a manual crypto position (e.g. BNB) to the portfolio for monitorin
 from position_manager import PositionManager
 from crypto_data_collector import CryptoDataCollector
 from datetime import datetime
-import importlib.util
+from data_collector import StockDataCollector
 
-# Import StockDataCollector from data-collector.py
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-spec.loader.exec_module(data_collector)
-stock_collector = data_collector.StockDataCollector()
+stock_collector = StockDataCollector()
 
 # --- User input ---
 symbol = "BNB-USD"  # Use USD for compatibility
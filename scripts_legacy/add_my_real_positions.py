@@ -3,19 +3,15 @@
 Add My Real Positions - Script con datos reales precalculados
 """
 
-import importlib.util
+from data_collector import StockDataCollector
 from datetime import datetime
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 from position_manager import PositionManager
 
 def add_all_real_positions():
     """Add all real positions with calculated average prices"""
     
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     
     print("🏦 ADDING ALL REAL PORTFOLIO POSITIONS")
@@ -161,7 +157,7 @@ def update_positions_with_current_prices():
     """Update all positions with current market prices"""
     print(f"\n🔄 UPDATING WITH CURRENT PRICES...")
     
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     
     updated = 0
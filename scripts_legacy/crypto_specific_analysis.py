@@ -7,6 +7,9 @@ Crypto-specific analysis and scoring logic.
 """
 import datetime
 
+import numpy as np
+import pandas as pd
+
 def analyze_crypto_signals(tech_indicators, price_data, classification=None):
     """Returns a buy_score and reasons for a crypto asset, using crypto-specific thresholds."""
     buy_score = 0
@@ -55,3 +58,59 @@ def analyze_crypto_signals(tech_indicators, price_data, classification=None):
         reasons.append("Technical analysis bullish")
 
     return buy_score, reasons
+
+def analyze_crypto_signals_batch(last_rows, classification=None):
+    """
+    Vectorised analyze_crypto_signals over a DataFrame with one row per symbol
+    (columns rsi, macd, macd_signal, close, bb_lower, optional pct_change_24h).
+    Returns (scores, reasons) aligned with last_rows.index.
+    """
+    n = len(last_rows)
+
+    def column(name):
+        if name not in last_rows.columns:
+            return np.full(n, np.nan)
+        return pd.to_numeric(last_rows[name], errors='coerce').to_numpy(dtype=float)
+
+    rsi = column('rsi')
+    macd = column('macd')
+    macd_signal = column('macd_signal')
+    close = column('close')
+    bb_lower = column('bb_lower')
+    pct_change_24h = np.nan_to_num(column('pct_change_24h'))
+    is_weekend = datetime.datetime.utcnow().weekday() >= 5
+
+    # NaN compares as False, which matches the scalar version's None checks
+    with np.errstate(invalid='ignore'):
+        rsi_very_oversold = rsi < 25
+        rsi_favorable = ~rsi_very_oversold & (rsi < 35)
+        macd_bullish = macd > macd_signal
+        below_bb = close < bb_lower
+    high_volatility = np.abs(pct_change_24h) > 10
+
+    scores = (3 * rsi_very_oversold + rsi_favorable + 2 * macd_bullish
+              + 2 * below_bb + high_volatility).astype(int)
+    if is_weekend:
+        scores += 1
+    if classification == 'BULLISH':
+        scores += 2
+
+    reasons = []
+    for i in range(n):
+        row_reasons = []
+        if rsi_very_oversold[i]:
+            row_reasons.append(f"RSI very oversold: {rsi[i]:.1f}")
+        elif rsi_favorable[i]:
+            row_reasons.append(f"RSI favorable: {rsi[i]:.1f}")
+        if macd_bullish[i]:
+            row_reasons.append("MACD bullish crossover")
+        if below_bb[i]:
+            row_reasons.append("Price below lower Bollinger Band")
+        if high_volatility[i]:
+            row_reasons.append(f"High 24h volatility: {pct_change_24h[i]:+.1f}%")
+        if is_weekend:
+            row_reasons.append("Weekend pattern: higher volatility expected")
+        if classification == 'BULLISH':
+            row_reasons.append("Technical analysis bullish")
+        reasons.append(row_reasons)
+    return scores, reasons
@@ -31,13 +31,18 @@ def filter_by_market_cap(coin_list, min_market_cap_usd=1_000_000_000):
     """Filter cryptos by market cap using CoinGecko API."""
     import requests
     filtered = []
-    for coin in coin_list:
-        coingecko_id = coin["name"].lower().replace(" ", "-")
-        url = f"https://api.coingecko.com/api/v3/coins/{coingecko_id}"
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            data = resp.json()
-            market_cap = data.get("market_data", {}).get("market_cap", {}).get("usd", 0)
-            if market_cap >= min_market_cap_usd:
-                filtered.append(coin)
+    # One keep-alive session for all coins instead of a new connection per request
+    with requests.Session() as session:
+        for coin in coin_list:
+            coingecko_id = coin["name"].lower().replace(" ", "-")
+            url = f"https://api.coingecko.com/api/v3/coins/{coingecko_id}"
+            try:
+                resp = session.get(url, timeout=10)
+            except requests.RequestException:
+                continue
+            if resp.status_code == 200:
+                data = resp.json()
+                market_cap = data.get("market_data", {}).get("market_cap", {}).get("usd", 0)
+                if market_cap >= min_market_cap_usd:
+                    filtered.append(coin)
     return filtered
@@ -3,15 +3,11 @@
 Debug Positions - Investigar discrepancias de precios
 """
 
-import importlib.util
+from data_collector import StockDataCollector
 from position_manager import PositionManager
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 def debug_all_positions():
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     
     print("🔍 DEBUGGING POSITION PRICES")
@@ -91,7 +87,7 @@ def check_real_vs_calculated():
     }
     print("📊 REAL vs CALCULATED P&L:")
     print("=" * 60)
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     for symbol in manager.positions.keys():
         real_data = real_positions.get(symbol, {})
@@ -3,17 +3,13 @@
 Fix Position Prices - Corregir precios incorrectos y símbolos
 """
 
-import importlib.util
+from data_collector import StockDataCollector
 from position_manager import PositionManager
 from database_manager import DatabaseManager
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 def fix_all_positions():
     """Fix all position prices based on real data"""
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     db = DatabaseManager()
     print("🔧 FIXING ALL POSITION PRICES")
@@ -115,7 +111,7 @@ def fix_all_positions():
 
 def verify_fixes():
     """Verify all positions now have reasonable P&L"""
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     print(f"\n✅ VERIFICATION - Updated Positions:")
     print("=" * 50)
@@ -3,16 +3,12 @@
 Fix Positions with Real P&L - Usar precios actuales del sistema + tu P&L real
 """
 
-import importlib.util
+from data_collector import StockDataCollector
 from position_manager import PositionManager
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 def fix_with_real_pnl():
     """Fix entry prices usando current system prices + real P&L"""
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     print("🔧 FIXING POSITIONS WITH REAL P&L DATA")
     print("=" * 50)
@@ -3,13 +3,9 @@
 Restore BTC-USD position to open positions (MANUAL)
 """
 
-import importlib.util
+from data_collector import StockDataCollector
 from datetime import datetime
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 from position_manager import PositionManager
 from database_manager import DatabaseManager
 from dataclasses import asdict
@@ -27,7 +23,7 @@ RESTORE_DATA = {
 }
 
 def restore_btc_position():
-    collector = data_collector.StockDataCollector()
+    collector = StockDataCollector()
     manager = PositionManager(collector)
     db = DatabaseManager()
 
@@ -3,19 +3,14 @@
 Sync Database - Sincronizar database con posiciones corregidas del sistema
 """
 
-import importlib.util
-from position_manager import PositionManager
+import numpy as np
+from data_collector import StockDataCollector
 from database_manager import DatabaseManager
 
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-
 def clean_and_sync_database():
     """Clean database and sync with corrected positions"""
     
-    collector = data_collector.StockDataCollector()
-    manager = PositionManager(collector)
+    collector = StockDataCollector()
     db = DatabaseManager()
     
     print("🧹 CLEANING AND SYNCING DATABASE")
@@ -27,15 +22,7 @@ def clean_and_sync_database():
     for pos in db_positions:
         print(f"   {pos['symbol']:12} | Entry: ${pos['entry_price']:8.2f} | Qty: {pos['quantity']:6.2f}")
     
-    # Step 2: Clear ALL positions from database
-    print(f"\n🗑️ Clearing all positions from database...")
-    cursor = db.conn.cursor()
-    cursor.execute("DELETE FROM positions")
-    db.conn.commit()
-    deleted_count = cursor.rowcount
-    print(f"   Deleted {deleted_count} old positions")
-    
-    # Step 3: Define correct positions based on your real data
+    # Step 2: Define correct positions based on your real data
     correct_positions = [
         # REVOLUT positions (USD)
         {
@@ -106,18 +93,29 @@ def clean_and_sync_database():
         }
     ]
     
+    # Step 3: Remove positions that are not in the corrected list
+    # (the rest are upserted in place in Step 4 instead of delete + re-insert)
+    print(f"\n🗑️ Removing positions not in the corrected list...")
+    symbols = [p["symbol"] for p in correct_positions]
+    with db.conn:
+        cursor = db.conn.execute(
+            f"DELETE FROM positions WHERE symbol NOT IN ({', '.join('?' * len(symbols))})", symbols)
+    deleted_count = cursor.rowcount
+    print(f"   Deleted {deleted_count} old positions")
+    
     # Step 4: Add corrected positions to database
     print(f"\n📥 Adding corrected positions to database:")
     
     total_expected_pnl = 0
+    positions_to_save = []
+    # Get current prices for all positions with a single download
+    current_prices = collector.get_current_prices(symbols)
     
     for pos_data in correct_positions:
-        # Get current price
-        stock_data = collector.get_stock_data(pos_data["symbol"])
+        current_price = current_prices.get(pos_data["symbol"])
+        expected_pnl = expected_pnl_pct = 0
         
-        if 'error' not in stock_data:
-            current_price = stock_data['price_data']['current_price']
-            
+        if current_price is not None:
             # Calculate expected P&L
             entry_value = pos_data["entry_price"] * pos_data["quantity"]
             current_value = current_price * pos_data["quantity"]
@@ -127,68 +125,82 @@ def clean_and_sync_database():
             total_expected_pnl += expected_pnl
             
             print(f"   {pos_data['symbol']:8} | Entry: ${pos_data['entry_price']:8.2f} | Current: ${current_price:8.2f} | P&L: {expected_pnl_pct:+6.1f}%")
-            
-            # Create position object for database
-            position_dict = {
-                'symbol': pos_data['symbol'],
-                'entry_date': '2025-08-09',
-                'entry_price': pos_data['entry_price'],
-                'quantity': pos_data['quantity'],
-                'stop_loss': pos_data['entry_price'] * (1 - pos_data['stop_loss_percent'] / 100),
-                'take_profit': pos_data['entry_price'] * (1 + pos_data['take_profit_percent'] / 100),
-                'current_price': current_price,
-                'unrealized_pnl': expected_pnl,
-                'unrealized_pnl_percent': expected_pnl_pct,
-                'days_held': 0,
-                'trailing_stop': pos_data['entry_price'] * (1 - pos_data['stop_loss_percent'] / 100),
-                'partial_sold': False,
-                'notes': pos_data['notes']
-            }
-            
-            # Save to database
-            try:
-                db.save_position(position_dict)
-                print(f"      ✅ Saved to database")
-            except Exception as e:
-                print(f"      ❌ Database error: {e}")
         else:
-            print(f"   {pos_data['symbol']:8} | ❌ Cannot get current price")
+            # The corrected entry/quantity/stops are written anyway; price and P&L start at entry
+            current_price = pos_data["entry_price"]
+            print(f"   {pos_data['symbol']:8} | Entry: ${pos_data['entry_price']:8.2f} | ⚠️ No current price, P&L left at 0")
+        
+        # Create position object for database (the trailing stop starts at the stop loss)
+        stop_loss = pos_data['entry_price'] * (1 - pos_data['stop_loss_percent'] / 100)
+        position_dict = {
+            'symbol': pos_data['symbol'],
+            'entry_date': '2025-08-09',
+            'entry_price': pos_data['entry_price'],
+            'quantity': pos_data['quantity'],
+            'stop_loss': stop_loss,
+            'take_profit': pos_data['entry_price'] * (1 + pos_data['take_profit_percent'] / 100),
+            'current_price': current_price,
+            'unrealized_pnl': expected_pnl,
+            'unrealized_pnl_percent': expected_pnl_pct,
+            'days_held': 0,
+            'trailing_stop': stop_loss,
+            'partial_sold': False,
+            'notes': pos_data['notes']
+        }
+        positions_to_save.append(position_dict)
+    
+    # Save to database (single upsert transaction)
+    try:
+        saved_count = db.save_positions(positions_to_save)
+        print(f"\n   ✅ Saved {saved_count} positions to database")
+    except Exception as e:
+        print(f"\n   ❌ Database error: {e}")
     
     print(f"\n📊 Expected Portfolio P&L: ${total_expected_pnl:+.2f}")
     
-    # Step 5: Verify sync
-    print(f"\n🔍 Verification - Reloading from database:")
-    new_manager = PositionManager(collector)
+    # Step 5: Verify sync against the corrected list, read straight from the database
+    print(f"\n🔍 Verification - Reading back from database:")
+    db_positions = {symbol: (entry_price, quantity)
+                    for symbol, entry_price, quantity in db.conn.execute("SELECT symbol, entry_price, quantity FROM positions")}
+    # Compare against the full corrected list
+    expected = {p['symbol']: (p['entry_price'], p['quantity']) for p in correct_positions}
+    mismatched = [symbol for symbol, values in expected.items() if db_positions.get(symbol) != values]
+    if mismatched:
+        print(f"   ❌ Database does not match the corrected positions: {', '.join(mismatched)}")
     
-    if new_manager.positions:
-        print(f"   ✅ Loaded {len(new_manager.positions)} positions")
+    if db_positions:
+        print(f"   ✅ Loaded {len(db_positions)} positions ({len(expected) - len(mismatched)}/{len(expected)} match the corrected list)")
+        # Reuse the Step 4 prices; symbols without a price there are skipped
+        symbols = [symbol for symbol in db_positions if symbol in current_prices]
+        
+        # P&L of all positions at once (read-only check, nothing is written back to the database)
+        current = np.array([current_prices[symbol] for symbol in symbols], dtype=np.float64)
+        entry = np.array([db_positions[symbol][0] for symbol in symbols], dtype=np.float64)
+        qty = np.array([db_positions[symbol][1] for symbol in symbols], dtype=np.float64)
+        pnl = (current - entry) * qty
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = pnl / (entry * qty) * 100
         
-        for symbol, position in new_manager.positions.items():
-            # Update with current price
-            stock_data = collector.get_stock_data(symbol)
-            if 'error' not in stock_data:
-                current_price = stock_data['price_data']['current_price']
-                new_manager.update_position(symbol, current_price)
-                
-                pnl_color = "📈" if position.unrealized_pnl >= 0 else "📉"
-                print(f"      {symbol:8} | {pnl_color} {position.unrealized_pnl_percent:+6.1f}% | ${position.unrealized_pnl:+8.2f}")
+        for symbol, position_pnl, position_pnl_pct in zip(symbols, pnl, pnl_pct):
+            pnl_color = "📈" if position_pnl >= 0 else "📉"
+            print(f"      {symbol:8} | {pnl_color} {position_pnl_pct:+6.1f}% | ${position_pnl:+8.2f}")
     
-    return new_manager
+    return db_positions
 
 def main():
     print("🔄 DATABASE SYNC TOOL")
     print("=" * 30)
     print("This will:")
-    print("1. Clear ALL positions from database")
-    print("2. Add corrected positions with proper entry prices")
+    print("1. Remove database positions not in the corrected list")
+    print("2. Add or overwrite corrected positions with proper entry prices")
     print("3. Sync database with current system state")
     print("4. Verify all P&L calculations")
     
-    print(f"\n⚠️ WARNING: This will DELETE all current database positions!")
+    print(f"\n⚠️ WARNING: This will DELETE or OVERWRITE all current database positions!")
     confirm = input("Are you sure? Type 'YES' to proceed: ")
     
     if confirm == "YES":
-        manager = clean_and_sync_database()
+        clean_and_sync_database()
         print(f"\n✅ Database synchronized!")
         print(f"   Next automated_trader.py run should show correct P&L")
     else:
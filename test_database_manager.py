@@ -0,0 +1,86 @@
+import sqlite3
+import unittest
+from database_manager import DatabaseManager
+
+def make_position(symbol, entry_price=100.0):
+    return {
+        'symbol': symbol,
+        'entry_date': '2025-08-09',
+        'entry_price': entry_price,
+        'quantity': 2,
+        'stop_loss': entry_price * 0.9,
+        'take_profit': entry_price * 1.2,
+        'current_price': entry_price * 1.1,
+        'notes': 'Manual'
+    }
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseManager(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_save_positions_inserts_all(self):
+        saved = self.db.save_positions([make_position("AAPL"), make_position("MSFT", 300.0)])
+        self.assertEqual(saved, 2)
+        positions = {p['symbol']: p for p in self.db.load_positions()}
+        self.assertEqual(set(positions), {"AAPL", "MSFT"})
+        self.assertEqual(positions["MSFT"]['entry_price'], 300.0)
+        self.assertEqual(positions["AAPL"]['position_type'], 'AUTO')
+        self.assertEqual(positions["AAPL"]['partial_sold'], 0)
+
+    def test_load_positions_returns_position_columns(self):
+        self.db.save_position(make_position("AAPL"))
+        self.assertEqual(tuple(self.db.load_positions()[0]), self.db.POSITION_COLUMNS)
+
+    def test_save_positions_empty(self):
+        self.assertEqual(self.db.save_positions([]), 0)
+        self.assertEqual(self.db.load_positions(), [])
+
+    def test_save_positions_is_atomic(self):
+        # El fallo llega en la segunda fila del executemany, con la primera ya actualizada:
+        # la transacción debe deshacerla
+        self.db.save_positions([make_position("AAPL")])
+        bad = dict(make_position("BAD"), notes=object())  # sqlite3 no puede enlazar este valor
+        with self.assertRaises(sqlite3.Error):
+            self.db.save_positions([make_position("AAPL", 150.0), bad])
+        rows = self.db.load_positions()
+        self.assertEqual([(row['symbol'], row['entry_price']) for row in rows], [("AAPL", 100.0)])
+
+    def test_save_position_matches_batch(self):
+        self.db.save_position(make_position("NDAQ", 77.12))
+        self.db.save_positions([make_position("BNTX", 110.66)])
+        rows = {p['symbol']: p for p in self.db.load_positions()}
+        self.assertEqual(rows["NDAQ"]['entry_price'], 77.12)
+        self.assertEqual(rows["BNTX"]['entry_price'], 110.66)
+
+    def test_symbol_lookups_use_index(self):
+        plan = self.db.conn.execute("EXPLAIN QUERY PLAN DELETE FROM positions WHERE symbol=?", ("AAPL",)).fetchall()
+        self.assertTrue(any('idx_positions_symbol' in row[-1] for row in plan))
+
+    def test_save_positions_upserts_by_symbol(self):
+        self.db.save_positions([make_position("AAPL"), make_position("MSFT", 300.0)])
+        self.db.save_positions([make_position("AAPL", 150.0), make_position("MSFT", 310.0)])
+        rows = {p['symbol']: p for p in self.db.load_positions()}
+        self.assertEqual(len(self.db.load_positions()), 2)
+        self.assertEqual(rows["AAPL"]['entry_price'], 150.0)
+        self.assertEqual(rows["MSFT"]['entry_price'], 310.0)
+
+    def test_save_position_keeps_manual_row(self):
+        # Una posición AUTO nueva no debe reemplazar la fila MANUAL del mismo símbolo
+        manual = dict(make_position("NDAQ", 77.12), position_type='MANUAL', notes='Real position - REVOLUT')
+        self.db.save_position(manual)
+        self.db.save_position(make_position("NDAQ", 80.0))
+        rows = self.db.load_positions()
+        self.assertEqual(len(rows), 2)
+        self.assertIn(('MANUAL', 77.12), [(row['position_type'], row['entry_price']) for row in rows])
+
+    def test_save_positions_overwrites_every_row_of_symbol(self):
+        self.db.save_position(make_position("BTC-USD"))
+        self.db.save_position(make_position("BTC-USD"))
+        self.db.save_positions([make_position("BTC-USD", 90000.0)])
+        self.assertEqual({row['entry_price'] for row in self.db.load_positions()}, {90000.0})
+
+if __name__ == "__main__":
+    unittest.main()
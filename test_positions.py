@@ -5,16 +5,10 @@ Test Positions - Sistema de pruebas para PositionManager
 
 import sys
 import os
-import importlib.util
 from datetime import datetime, timedelta
 import time
 
-# Import desde data-collector.py (con guión)
-spec = importlib.util.spec_from_file_location("data_collector", "data-collector.py")
-data_collector = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(data_collector)
-StockDataCollector = data_collector.StockDataCollector
-
+from data_collector import StockDataCollector
 from position_manager import PositionManager, PositionDecision
 
 def test_position_management():
@@ -53,7 +47,7 @@ def test_position_management():
             current_price = stock_data['price_data']['current_price']
             manager.update_position(symbol, current_price)
             
-            decision, reasons = manager.analyze_position_decision(symbol)
+            decision, reasons = manager.analyze_position_decision(symbol, stock_data)
             position = manager.positions[symbol]
             
             print(f"\n {symbol}:")
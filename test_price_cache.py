@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+import price_cache
+
+class FakeCollector:
+    def __init__(self):
+        self.calls = 0
+
+    def get_stock_data(self, symbol):
+        self.calls += 1
+        if symbol == "ZZZZZZ":
+            return {'symbol': symbol, 'error': 'No data'}
+        return {'symbol': symbol, 'price_data': {'current_price': 100.0 + self.calls}}
+
+class TestPriceCache(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = price_cache.CACHE_DIR
+        self.tmp_dir = tempfile.mkdtemp()
+        price_cache.CACHE_DIR = os.path.join(self.tmp_dir, "prices")
+        self.collector = FakeCollector()
+
+    def tearDown(self):
+        price_cache.CACHE_DIR = self.original_dir
+        shutil.rmtree(self.tmp_dir)
+
+    def test_second_call_hits_cache(self):
+        first = price_cache.get(self.collector, "BTC-USD")
+        second = price_cache.get(self.collector, "BTC-USD")
+        self.assertEqual(self.collector.calls, 1)
+        self.assertEqual(first, second)
+
+    def test_expired_entry_is_refetched(self):
+        price_cache.get(self.collector, "AAPL")
+        data = price_cache.get(self.collector, "AAPL", ttl=0)
+        self.assertEqual(self.collector.calls, 2)
+        self.assertEqual(data['price_data']['current_price'], 102.0)
+
+    def test_get_cached_does_not_fetch(self):
+        self.assertIsNone(price_cache.get_cached("ETH-USD"))
+        data = price_cache.get(self.collector, "ETH-USD")
+        self.assertEqual(price_cache.get_cached("ETH-USD"), data)
+        self.assertIsNone(price_cache.get_cached("ETH-USD", ttl=0))
+        self.assertEqual(self.collector.calls, 1)
+
+    def test_errors_are_not_cached(self):
+        price_cache.get(self.collector, "ZZZZZZ")
+        price_cache.get(self.collector, "ZZZZZZ")
+        self.assertEqual(self.collector.calls, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,9 +5,11 @@ UnifiedTrader: Handles both stocks and crypto with separate limits and risk mana
 - Uses existing PositionManager, CryptoDataCollector, and StockDataCollector
 - Calls crypto_specific_analysis for crypto, stock analysis for stocks
 """
+import pandas as pd
+
 from crypto_data_collector import CryptoDataCollector
 from crypto_watchlist import CRYPTO_WATCHLIST
-from crypto_specific_analysis import analyze_crypto_signals
+from crypto_specific_analysis import analyze_crypto_signals_batch
 # from stock_data_collector import StockDataCollector  # assumed to exist
 # from stock_analysis import analyze_stock_signals     # assumed to exist
 from position_manager import PositionManager
@@ -36,20 +38,23 @@ class UnifiedTrader:
 
         # --- CRYPTO ---
         crypto_opportunities = []
+        # Una sola descarga para todo el watchlist
+        batch = self.crypto_collector.get_yfinance_data_batch([coin["symbol"] for coin in CRYPTO_WATCHLIST])
+        last_rows = {}
         for coin in CRYPTO_WATCHLIST:
             symbol = coin["symbol"]
-            data = self.crypto_collector.get_yfinance_data(symbol)
+            data = batch.get(symbol)
             if data is None or data.empty:
                 continue
-            # Ensure 'close' column exists (yfinance returns 'Close' by default)
-            if "close" not in data.columns and "Close" in data.columns:
-                data["close"] = data["Close"]
-            tech_ind = data.iloc[-1].to_dict()
-            price_data = {"close": tech_ind.get("close")}
-            # Optionally add pct_change_24h if available
-            score, reasons = analyze_crypto_signals(tech_ind, price_data)
-            if score >= 5:
-                crypto_opportunities.append({"symbol": symbol, "score": score, "reasons": reasons})
+            last_rows[symbol] = data.tail(1)
+        if last_rows:
+            # Una fila por símbolo: se puntúan todos a la vez
+            last = pd.concat(last_rows).droplevel(1)
+            # Optionally add a pct_change_24h column if available
+            scores, reasons = analyze_crypto_signals_batch(last)
+            for symbol, score, coin_reasons in zip(last.index, scores, reasons):
+                if score >= 5:
+                    crypto_opportunities.append({"symbol": symbol, "score": int(score), "reasons": coin_reasons})
         # Open crypto positions up to max_crypto_positions
         # ...existing code for crypto position management...
         return {"stock_opportunities": stock_opportunities, "crypto_opportunities": crypto_opportunities}
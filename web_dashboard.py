@@ -3,11 +3,18 @@
 Simple Web Dashboard for monitoring trading system
 """
 
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, jsonify
 from datetime import datetime
 import os
+import time
+import threading
 import sqlite3
 import json
+import numpy as np
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
@@ -93,44 +100,83 @@ DASHBOARD_HTML = """
 </body>
 </html>
 """
+# Compilada una sola vez (render_template_string la volvía a parsear en cada petición)
+_TEMPLATE = app.jinja_env.from_string(DASHBOARD_HTML)
+
+DB_PATH = "/app/data/trading.db"
+# Solo las columnas que usa la plantilla y los totales
+POSITION_COLUMNS = ("symbol", "entry_price", "current_price", "quantity", "unrealized_pnl", "unrealized_pnl_percent")
+POSITIONS_SQL = f"SELECT {', '.join(POSITION_COLUMNS)} FROM positions"
+CACHE_TTL = 10  # segundos; la página se refresca cada 30s
+MMAP_SIZE = 256 * 1024 * 1024  # bytes de la DB mapeados en memoria
+_cache_lock = threading.Lock()
+_portfolio_cache = None  # (timestamp, (portfolio, positions)); solo lecturas correctas
+EMPTY_PORTFOLIO = {"total_positions": 0, "total_pnl": 0, "total_value": 0}
+_conn = None
+
+def _get_connection():
+    """Read-only connection reused across requests (opened on first use, guarded by _cache_lock)"""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA query_only=ON")
+        # Lecturas vía mmap (sin copia user/kernel por página) y temporales en memoria
+        _conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        _conn.execute("PRAGMA temp_store=MEMORY")
+    return _conn
+
+def _reset_connection():
+    global _conn
+    if _conn is not None:
+        try:
+            _conn.close()
+        except sqlite3.Error:
+            pass
+        _conn = None
 
 def get_portfolio_data():
-    """Get portfolio data from SQLite database"""
-    try:
-        db_path = "/app/data/trading.db"
-        if not os.path.exists(db_path):
-            return {"total_positions": 0, "total_pnl": 0, "total_value": 0}, []
-        
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Get positions
-        cursor.execute("SELECT * FROM positions")
-        positions = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-        
-        position_list = []
-        total_pnl = 0
-        total_value = 0
-        
-        for pos in positions:
-            pos_dict = dict(zip(columns, pos))
-            position_list.append(pos_dict)
-            total_pnl += pos_dict.get('unrealized_pnl', 0)
-            total_value += pos_dict.get('current_price', 0) * pos_dict.get('quantity', 0)
-        
-        portfolio = {
-            "total_positions": len(position_list),
-            "total_pnl": total_pnl,
-            "total_value": total_value
-        }
-        
-        conn.close()
-        return portfolio, position_list
-        
-    except Exception as e:
-        print(f"Database error: {e}")
-        return {"total_positions": 0, "total_pnl": 0, "total_value": 0}, []
+    """Get portfolio data, reusing the last successful read for CACHE_TTL seconds"""
+    global _portfolio_cache
+    # El lock también evita que varias peticiones simultáneas lean la DB a la vez
+    with _cache_lock:
+        if _portfolio_cache is not None and time.monotonic() - _portfolio_cache[0] < CACHE_TTL:
+            return _portfolio_cache[1]
+        if not os.path.exists(DB_PATH):
+            return EMPTY_PORTFOLIO.copy(), []
+        try:
+            result = _load_portfolio_data()
+        except Exception as e:
+            print(f"Database error: {e}")
+            # No se cachea el fallo; reabrir en la próxima petición (p.ej. si la DB fue reemplazada)
+            _portfolio_cache = None
+            _reset_connection()
+            return EMPTY_PORTFOLIO.copy(), []
+        _portfolio_cache = (time.monotonic(), result)
+        return result
+
+def _load_portfolio_data():
+    """Get portfolio data from SQLite database (errors propagate to get_portfolio_data)"""
+    cursor = _get_connection().cursor()
+    
+    # Get positions
+    cursor.execute(POSITIONS_SQL)
+    positions = cursor.fetchall()
+    
+    position_list = [dict(zip(POSITION_COLUMNS, pos)) for pos in positions]
+    
+    # Totales vectorizados: columnas (pnl, precio, cantidad); NULL cuenta como 0
+    values = np.array([(pos[4], pos[2], pos[3]) for pos in positions], dtype=np.float64).reshape(-1, 3)
+    values = np.nan_to_num(values)
+    total_pnl = float(values[:, 0].sum())
+    total_value = float(np.vdot(values[:, 1], values[:, 2]))
+    
+    portfolio = {
+        "total_positions": len(position_list),
+        "total_pnl": total_pnl,
+        "total_value": total_value
+    }
+    
+    return portfolio, position_list
 
 @app.route('/')
 def dashboard():
@@ -143,21 +189,32 @@ def dashboard():
         {"time": "12:20", "symbol": "SLV", "message": "Take partial profit - P&L: +9.4%"}
     ]
     
-    return render_template_string(DASHBOARD_HTML, 
-                                  current_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                  portfolio=portfolio,
-                                  positions=positions,
-                                  recent_signals=recent_signals)
+    return _TEMPLATE.render(current_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            portfolio=portfolio,
+                            positions=positions,
+                            recent_signals=recent_signals)
 
 @app.route('/api/status')
 def api_status():
     portfolio, positions = get_portfolio_data()
-    return jsonify({
+    payload = {
         "status": "running",
         "timestamp": datetime.now().isoformat(),
         "portfolio": portfolio,
         "positions_count": len(positions)
-    })
+    }
+    if orjson is not None:
+        return Response(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY), mimetype='application/json')
+    return jsonify(payload)
+
+def run_server():
+    # Servidor WSGI multi-hilo si está instalado; si no, el servidor de desarrollo de Flask
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=8080, debug=False, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=8080, threads=8)
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8080, debug=False)
+    run_server()